@@ -3,15 +3,20 @@
 Provides functions for encrypting passwords using bcrypt.
 
 This module contains functions for generating a salted hash of a password
-and checking if a given password matches a hashed password.
+and checking if a given password matches a hashed password. The bcrypt
+work factor is read from the BCRYPT_COST environment variable (default 12).
 
 Example:
     hashed_password = hash_password("password123")
     is_valid = is_valid(hashed_password, "password123")
 """
 
+import hmac
+import os
 import bcrypt
 
+BCRYPT_COST = int(os.environ.get("BCRYPT_COST", "12"))
+
 
 def hash_password(password: str) -> bytes:
     """
@@ -23,7 +28,8 @@ def hash_password(password: str) -> bytes:
     Returns:
         bytes: The salted hash of the password.
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'),
+                         bcrypt.gensalt(BCRYPT_COST))
 
 
 def is_valid(hashed_password: bytes, password: str) -> bool:
@@ -37,4 +43,5 @@ def is_valid(hashed_password: bytes, password: str) -> bool:
     Returns:
         bool: True if the password matches the hashed password, False otherwise.
     """
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+    candidate = bcrypt.hashpw(password.encode('utf-8'), hashed_password)
+    return hmac.compare_digest(candidate, hashed_password)
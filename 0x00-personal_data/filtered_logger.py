@@ -14,10 +14,43 @@ Example:
 import logging
 import os
 import re
-from typing import List
+from functools import lru_cache
+from typing import Iterator, List, Match, Pattern, Tuple
 import mysql.connector
+import mysql.connector.pooling
 
 PII_FIELDS = ("name", "email", "phone", "ssn", "password")
+USER_COLUMNS = ("name", "email", "phone", "ssn", "password", "ip",
+                "last_login", "user_agent")
+BATCH_SIZE = 1000
+POOL_SIZE = int(os.environ.get("PERSONAL_DATA_DB_POOL_SIZE", "1"))
+ROW_TEMPLATE = ("name=%s; email=%s; phone=%s; ssn=%s; password=%s;ip=%s; "
+                "last_login=%s; user_agent=%s;")
+
+_pool = None
+
+
+@lru_cache(maxsize=32)
+def _redaction_pattern(fields: Tuple[str, ...], separator: str,
+                       flags: int = 0) -> Pattern:
+    """
+    Compiles a single pattern matching any of the given fields.
+
+    Args:
+        fields (Tuple[str, ...]): The sensitive fields to match.
+        separator (str): The separator used to separate fields in the message.
+        flags (int): Regex flags to compile the pattern with.
+
+    Returns:
+        Pattern: The compiled pattern, with the field name as group 1.
+    """
+    names = "|".join(map(re.escape, fields))
+    sep = re.escape(separator)
+    if len(separator) == 1:
+        value = rf"[^{sep}]*"
+    else:
+        value = rf"(?:(?!{sep}).)*"
+    return re.compile(rf"({names})={value}", flags)
 
 
 def filter_datum(fields: List[str], redaction: str, message: str,
@@ -34,10 +67,10 @@ def filter_datum(fields: List[str], redaction: str, message: str,
     Returns:
         str: The filtered log message with sensitive information redacted.
     """
-    for f in fields:
-        message = re.sub(rf"{f}=(.*?)\{separator}",
-                         f'{f}={redaction}{separator}', message)
-    return message
+    if not fields:
+        return message
+    pattern = _redaction_pattern(tuple(fields), separator)
+    return pattern.sub(lambda m: f"{m.group(1)}={redaction}", message)
 
 
 class RedactingFormatter(logging.Formatter):
@@ -58,12 +91,30 @@ class RedactingFormatter(logging.Formatter):
         """
         Initializes the RedactingFormatter instance with a list of PII fields.
 
+        Field names are matched case-insensitively.
+
         Args:
             fields (List[str]): List of sensitive fields to redact.
         """
-        self.fields = fields
+        self.fields = tuple(f.lower() for f in fields)
+        self._pattern = None
+        if self.fields:
+            self._pattern = _redaction_pattern(self.fields, self.SEPARATOR,
+                                               re.IGNORECASE)
         super(RedactingFormatter, self).__init__(self.FORMAT)
 
+    def _redact(self, match: Match) -> str:
+        """
+        Builds the redacted replacement for a single matched field.
+
+        Args:
+            match (Match): The match of a sensitive field.
+
+        Returns:
+            str: The field name followed by the redaction string.
+        """
+        return f"{match.group(1)}={self.REDACTION}"
+
     def format(self, record: logging.LogRecord) -> str:
         """
         Formats the log record while redacting PII fields.
@@ -74,8 +125,10 @@ class RedactingFormatter(logging.Formatter):
         Returns:
             str: The formatted log message with sensitive information redacted.
         """
-        return filter_datum(self.fields, self.REDACTION,
-                            super().format(record), self.SEPARATOR)
+        message = super().format(record)
+        if self._pattern is None:
+            return message
+        return self._pattern.sub(self._redact, message)
 
 
 def get_logger() -> logging.Logger:
@@ -98,33 +151,63 @@ def get_db() -> mysql.connector.connection.MySQLConnection:
     """
     Connects to the MySQL database.
 
+    When PERSONAL_DATA_DB_POOL_SIZE is above 1, connections are taken from
+    a pool created on the first call instead, and closing one returns it
+    to the pool.
+
     Returns:
-        mysql.connector.connection.MySQLConnection: The database connection object.
+        mysql.connector.connection.MySQLConnection: The database
+            connection object.
     """
+    global _pool
     psw = os.environ.get("PERSONAL_DATA_DB_PASSWORD", "")
     username = os.environ.get('PERSONAL_DATA_DB_USERNAME', "root")
     host = os.environ.get('PERSONAL_DATA_DB_HOST', 'localhost')
     db_name = os.environ.get('PERSONAL_DATA_DB_NAME')
-    conn = mysql.connector.connect(
-        host=host,
-        database=db_name,
-        user=username,
-        password=psw)
-    return conn
+    if POOL_SIZE <= 1:
+        return mysql.connector.connect(
+            host=host,
+            database=db_name,
+            user=username,
+            password=psw)
+    if _pool is None:
+        _pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name="personal_data",
+            pool_size=POOL_SIZE,
+            host=host,
+            database=db_name,
+            user=username,
+            password=psw)
+    return _pool.get_connection()
+
+
+def fetch_batched(cursor, size: int = BATCH_SIZE) -> Iterator[tuple]:
+    """
+    Yields rows from a cursor, fetching them from the server in batches.
+
+    Args:
+        cursor: An executed database cursor.
+        size (int): The number of rows to fetch per round-trip.
+
+    Yields:
+        tuple: The rows of the result set, one at a time.
+    """
+    rows = cursor.fetchmany(size)
+    while rows:
+        yield from rows
+        rows = cursor.fetchmany(size)
 
 
 def main() -> None:
     """
-    Retrieves user data from the database and prints it while redacting PII fields.
+    Retrieves user data from the database and logs it while redacting PII fields.
     """
+    logger = get_logger()
     db = get_db()
-    cursor = db.cursor()
-    cursor.execute("SELECT * FROM users;")
-    for row in cursor:
-        message = f"name={row[0]}; email={row[1]}; phone={row[2]}; " +\
-            f"ssn={row[3]}; password={row[4]};ip={row[5]}; " +\
-            f"last_login={row[6]}; user_agent={row[7]};"
-        print(message)
+    cursor = db.cursor(buffered=False)
+    cursor.execute("SELECT {} FROM users;".format(", ".join(USER_COLUMNS)))
+    for row in fetch_batched(cursor):
+        logger.info(ROW_TEMPLATE % row)
     cursor.close()
     db.close()
 
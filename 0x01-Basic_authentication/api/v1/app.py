@@ -21,6 +21,9 @@ if getenv("AUTH_TYPE") == "auth":
 elif getenv("AUTH_TYPE") == "basic_auth":
     auth = BasicAuth()
 
+EXCLUDED_PATHS = ('/api/v1/status/', '/api/v1/unauthorized/',
+                  '/api/v1/forbidden/')
+
 
 @app.errorhandler(404)
 def not_found(error) -> str:
@@ -52,8 +55,7 @@ def before_request():
     """
     if auth is None:
         return
-    excluded_paths = ['/api/v1/status/', '/api/v1/unauthorized/', '/api/v1/forbidden/']
-    if not auth.require_auth(request.path, excluded_paths):
+    if not auth.require_auth(request.path, EXCLUDED_PATHS):
         return
     if auth.authorization_header(request) is None:
         abort(401)
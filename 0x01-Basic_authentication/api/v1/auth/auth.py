@@ -3,12 +3,26 @@
 Auth class
 """
 
-from tabnanny import check
 from flask import request
-from typing import TypeVar, List
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Pattern, Tuple, TypeVar
+import re
 User = TypeVar('User')
 
 
+@lru_cache(maxsize=8)
+def _excluded_matcher(excluded_paths: Tuple[str, ...]
+                      ) -> Tuple[FrozenSet[str], Optional[Pattern]]:
+    """
+    compiles excluded_paths into a set of exact paths and a pattern
+    matching the paths that end with a '*' wildcard
+    """
+    exact = frozenset(p for p in excluded_paths if not p.endswith("*"))
+    prefixes = [re.escape(p[:-1]) for p in excluded_paths if p.endswith("*")]
+    wildcard = re.compile("|".join(prefixes)) if prefixes else None
+    return exact, wildcard
+
+
 class Auth:
     """
     a class to manage the API authentication
@@ -18,12 +32,13 @@ class Auth:
         """
         returns False - path and excluded_paths
         """
-        check = path
-        if path is None or excluded_paths is None or len(excluded_paths) == 0:
+        if path is None or not excluded_paths:
             return True
-        if path[-1] != "/":
-            check += "/"
-        if check in excluded_paths or path in excluded_paths:
+        exact, wildcard = _excluded_matcher(tuple(excluded_paths))
+        check = path if path.endswith("/") else path + "/"
+        if check in exact or path in exact:
+            return False
+        if wildcard is not None and wildcard.match(path):
             return False
         return True
 
@@ -6,7 +6,6 @@ Basic Auth module
 from api.v1.auth.auth import Auth
 from typing import Tuple, TypeVar, List
 from models.user import User
-import base64
 import binascii
 
 
@@ -21,9 +20,8 @@ class BasicAuth(Auth):
          returns the Base64 part of the Authorization
          header for a Basic Authentication
         """
-        if (authorization_header is None or
-                not isinstance(authorization_header, str) or
-                not authorization_header.startswith("Basic")):
+        if (not isinstance(authorization_header, str) or
+                not authorization_header.startswith("Basic ")):
             return None
 
         return authorization_header[6:]
@@ -37,10 +35,9 @@ class BasicAuth(Auth):
         b64_auth_header = base64_authorization_header
         if b64_auth_header and isinstance(b64_auth_header, str):
             try:
-                encode = b64_auth_header.encode('utf-8')
-                base = base64.b64decode(encode)
-                return base.decode('utf-8')
-            except binascii.Error:
+                return binascii.a2b_base64(b64_auth_header).decode('utf-8')
+            except ValueError:
+                # binascii.Error, non-ASCII input and invalid UTF-8 alike
                 return None
 
     def extract_user_credentials(
@@ -49,10 +46,10 @@ class BasicAuth(Auth):
         returns the user email and password from the Base64 decoded value.
         """
         decoded_64 = decoded_base64_authorization_header
-        if (decoded_64 and isinstance(decoded_64, str) and
-                ":" in decoded_64):
-            res = decoded_64.split(":", 1)
-            return (res[0], res[1])
+        if decoded_64 and isinstance(decoded_64, str):
+            email, sep, password = decoded_64.partition(":")
+            if sep:
+                return (email, password)
         return (None, None)
 
     def current_user(self, request=None) -> TypeVar('User'):
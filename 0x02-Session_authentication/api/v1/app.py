@@ -25,6 +25,14 @@ elif getenv("AUTH_TYPE") == "basic_auth":
 elif getenv("AUTH_TYPE") == "session_auth":
     auth = SessionAuth()
 
+# Paths that can be reached without authentication
+EXCLUDED_PATHS = (
+    '/api/v1/status/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+    '/api/v1/auth_session/login/'
+)
+
 
 @app.errorhandler(404)
 def not_found(error) -> str:
@@ -59,14 +67,7 @@ def before_request():
     Handler executed before each request
     Checks if the request requires authentication and handles authorization.
     """
-    authorized_list = [
-        '/api/v1/status/',
-        '/api/v1/unauthorized/',
-        '/api/v1/forbidden/',
-        '/api/v1/auth_session/login/'
-    ]
-
-    if auth and auth.require_auth(request.path, authorized_list):
+    if auth and auth.require_auth(request.path, EXCLUDED_PATHS):
         if not auth.authorization_header(request):
             abort(401)
         if (auth.authorization_header(request) and
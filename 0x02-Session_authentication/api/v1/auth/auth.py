@@ -3,11 +3,34 @@
 Auth class
 """
 
-from tabnanny import check
 from flask import request
-from typing import TypeVar, List
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Pattern, Tuple, TypeVar
+import re
 from os import getenv
 User = TypeVar('User')
+SESSION_NAME = getenv("SESSION_NAME")
+
+
+@lru_cache(maxsize=8)
+def _excluded_matcher(excluded_paths: Tuple[str, ...]
+                      ) -> Tuple[FrozenSet[str], Optional[Pattern]]:
+    """
+    Compiles excluded paths into exact paths and a wildcard pattern.
+
+    Args:
+        excluded_paths (Tuple[str, ...]): The paths that do not require
+            authentication; a trailing '*' matches any suffix.
+
+    Returns:
+        tuple: The exact paths, and a pattern matching the wildcard
+            prefixes or None if there are none.
+    """
+    exact = frozenset(p for p in excluded_paths if not p.endswith("*"))
+    prefixes = [re.escape(p[:-1]) for p in excluded_paths if p.endswith("*")]
+    wildcard = re.compile("|".join(prefixes)) if prefixes else None
+    return exact, wildcard
+
 
 class Auth:
     """
@@ -25,12 +48,13 @@ class Auth:
         Returns:
             bool: True if authentication is required, False otherwise.
         """
-        check = path
-        if path is None or excluded_paths is None or len(excluded_paths) == 0:
+        if path is None or not excluded_paths:
             return True
-        if path[-1] != "/":
-            check += "/"
-        if check in excluded_paths or path in excluded_paths:
+        exact, wildcard = _excluded_matcher(tuple(excluded_paths))
+        check = path if path.endswith("/") else path + "/"
+        if check in exact or path in exact:
+            return False
+        if wildcard is not None and wildcard.match(path):
             return False
         return True
 
@@ -71,5 +95,4 @@ class Auth:
             str: The value of the session cookie, or None if not present.
         """
         if request:
-            session_name = getenv("SESSION_NAME")
-            return request.cookies.get(session_name, None)
+            return request.cookies.get(SESSION_NAME, None)
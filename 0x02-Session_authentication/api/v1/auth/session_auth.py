@@ -5,15 +5,19 @@ SessionAuth
 
 from api.v1.auth.auth import Auth
 from typing import TypeVar
-from uuid import uuid4
+from secrets import token_urlsafe
 from models.user import User
 
 class SessionAuth(Auth):
     """
     SessionAuth class for handling session-based authentication.
     """
-    # Dictionary to store the mapping of session IDs to user IDs
-    user_id_by_session_id = {}
+
+    def __init__(self):
+        """
+        Initializes the mapping of session IDs to user IDs.
+        """
+        self.user_id_by_session_id = {}
 
     def create_session(self, user_id: str = None) -> str:
         """
@@ -27,9 +31,9 @@ class SessionAuth(Auth):
         """
         if not user_id or type(user_id) != str:
             return
-        session_id = str(uuid4())
-        # Store the session ID with the associated user ID
-        SessionAuth.user_id_by_session_id[user_id] = session_id
+        session_id = token_urlsafe(16)
+        # Store the user ID under its session ID
+        self.user_id_by_session_id[session_id] = user_id
         return session_id
 
     def user_id_for_session_id(self, session_id: str = None) -> str:
@@ -42,9 +46,9 @@ class SessionAuth(Auth):
         Returns:
             str: The user ID associated with the given session ID, or None if invalid.
         """
-        if not session_id or type(session_id) != str:
-            return
-        return SessionAuth.user_id_by_session_id.get(session_id, None)
+        if not session_id:
+            return None
+        return self.user_id_by_session_id.get(session_id)
 
     def current_user(self, request=None) -> TypeVar('User'):
         """
@@ -5,9 +5,25 @@ Session Authentication Views
 """
 
 from flask import request, jsonify, abort
+from api.v1.auth.auth import SESSION_NAME
 from api.v1.views import app_views
 from models.user import User
-from os import getenv
+
+_auth = None
+
+
+def _get_auth():
+    """
+    Returns the application's auth instance, importing it on first use.
+
+    The import cannot happen at module level because api.v1.app imports
+    the views package before it defines auth.
+    """
+    global _auth
+    if _auth is None:
+        from api.v1.app import auth
+        _auth = auth
+    return _auth
 
 
 @app_views.route('/auth_session/login', methods=['POST'], strict_slashes=False)
@@ -32,27 +48,23 @@ def login():
     
     try:
         # Search for user by email
-        user = User.search({"email": user_email})
+        users = User.search({"email": user_email})
     except Exception:
         return jsonify(error="no user found for this email"), 404
     
-    # Check if user exists
-    if not user:
+    # Check if user exists; emails are unique, so only the first match counts
+    if not users:
         return jsonify(error="no user found for this email"), 404
-    
-    # Validate password for each user found
-    for u in user:
-        if u.is_valid_password(user_pwd):
-            user_id = u.id
-            from api.v1.app import auth
-            session_id = auth.create_session(user_id)
-            response = jsonify(u.to_json())
-            response.set_cookie(getenv('SESSION_NAME'), session_id)
-            return response
-        else:
-            return jsonify(error="wrong password"), 401
+    user = users[0]
 
-    return jsonify(error="no user found for this email"), 404
+    # Validate the password once
+    if not user.is_valid_password(user_pwd):
+        return jsonify(error="wrong password"), 401
+
+    session_id = _get_auth().create_session(user.id)
+    response = jsonify(user.to_json())
+    response.set_cookie(SESSION_NAME, session_id)
+    return response
 
 
 @app_views.route('/auth_session/logout', methods=['DELETE'], strict_slashes=False)
@@ -64,10 +76,8 @@ def logout():
     Return:
       - Response: JSON response indicating success or failure.
     """
-    from api.v1.app import auth
-    
     # Attempt to destroy the session
-    if auth.destroy_session(request):
+    if _get_auth().destroy_session(request):
         return jsonify({}), 200
     
     abort(404)
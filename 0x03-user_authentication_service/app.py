@@ -24,6 +24,18 @@ from flask import Flask, jsonify, request, abort, redirect
 AUTH = Auth()
 app = Flask(__name__)
 
+
+@app.teardown_appcontext
+def release_db_session(exception=None) -> None:
+    """Releases the request's database session once the request is done.
+
+    Args:
+        exception (Exception, optional): The error that ended the
+            request, if any.
+    """
+    AUTH.release_db_session()
+
+
 @app.route('/', methods=['GET'], strict_slashes=False)
 def welcome() -> str:
     """Handles GET requests to the root URL.
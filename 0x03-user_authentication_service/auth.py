@@ -3,18 +3,27 @@
 """
 
 from db import DB
+from os import getenv
 from typing import TypeVar
 from user import User
 import bcrypt
 from uuid import uuid4
-from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
+
+BCRYPT_COST = int(getenv("BCRYPT_COST", "12"))
+
+# Checked against when no user matches, so a failed lookup costs as much
+# as a wrong password.
+_DUMMY_HASH = bcrypt.hashpw(b"", bcrypt.gensalt(BCRYPT_COST))
 
 
 def _hash_password(password: str) -> str:
     """
     _hash_password.
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'),
+                         bcrypt.gensalt(BCRYPT_COST))
 
 
 def _generate_uuid() -> str:
@@ -32,23 +41,34 @@ class Auth:
     def __init__(self):
         self._db = DB()
 
+    def release_db_session(self) -> None:
+        """
+        release_db_session.
+        """
+        self._db.remove_session()
+
     def register_user(self, email: str, password: str) -> User:
         """
         register_user.
         """
-        try:
-            self._db.find_user_by(email=email)
+        if self._db.exists(email=email):
             raise ValueError(f"User {email} already exists")
-        except NoResultFound:
+        try:
             return self._db.add_user(email, _hash_password(password))
+        except IntegrityError:
+            # Registered concurrently, between the check and the insert
+            raise ValueError(f"User {email} already exists")
 
     def valid_login(self, email: str, password: str) -> bool:
         """
         valid_login.
         """
+        if not isinstance(password, str):
+            return False
         try:
             user = self._db.find_user_by(email=email)
-        except NoResultFound:
+        except (NoResultFound, MultipleResultsFound):
+            bcrypt.checkpw(password.encode('utf-8'), _DUMMY_HASH)
             return False
         return bcrypt.checkpw(password.encode('utf-8'), user.hashed_password)
 
@@ -61,7 +81,7 @@ class Auth:
             sess_id = _generate_uuid()
             self._db.update_user(user.id, session_id=sess_id)
             return sess_id
-        except NoResultFound:
+        except (NoResultFound, MultipleResultsFound):
             return
 
     def get_user_from_session_id(self, session_id: str) -> str:
@@ -81,8 +101,7 @@ class Auth:
         destroy_session.
         """
         try:
-            user = self._db.find_user_by(id=user_id)
-            self._db.update_user(user.id, session_id=None)
+            self._db.update_user(user_id, session_id=None)
         except NoResultFound:
             pass
 
@@ -95,7 +114,7 @@ class Auth:
             reset_token = _generate_uuid()
             self._db.update_user(user.id, reset_token=reset_token)
             return reset_token
-        except NoResultFound:
+        except (NoResultFound, MultipleResultsFound):
             raise ValueError
 
     def update_password(self, reset_token: str, password: str) -> None:
@@ -103,8 +122,8 @@ class Auth:
         update_password.
         """
         try:
-            user = self._db.find_user_by(reset_token=reset_token)
-            self._db.update_user(user.id,
+            user_id = self._db.find_id_by(reset_token=reset_token)
+            self._db.update_user(user_id,
                                  hashed_password=_hash_password(password),
                                  reset_token=None)
         except NoResultFound:
@@ -13,18 +13,90 @@ Classes:
     DB: A class for managing the user database, including adding, finding, and updating users.
 
 Functions:
-    _session: A property that initializes and returns the database session.
+    _set_sqlite_pragmas: Applies SQLITE_PRAGMAS to each new SQLite connection.
+    _find_by_stmt: Builds the cached lookup statement for a single field.
+    _session: A property that returns the current thread's database session.
 """
 
-from sqlalchemy import create_engine
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from os import getenv
+from time import monotonic
+from sqlalchemy import (bindparam, create_engine, event, lambda_stmt, select,
+                        update)
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm.exc import NoResultFound
 from user import Base, User
-from typing import TypeVar
+from typing import Iterator, List, TypeVar
+
+VALID_FIELDS = frozenset(
+    ('id', 'email', 'hashed_password', 'session_id', 'reset_token'))
+FIND_CACHE_SIZE = 128
+FIND_CACHE_TTL = 1.0
+# Lookups on these are authentication checks and always hit the database
+UNCACHED_FIELDS = frozenset(('session_id', 'reset_token'))
+DEFAULT_DB_URL = "sqlite:///a.db"
+
+# Shared by every DB instance; each instance binds it to its own engine.
+# Objects are not expired on commit, so reading an attribute of a User
+# after add_user or update_user does not trigger another SELECT.
+DBSession = sessionmaker(expire_on_commit=False)
+
+# Applied to every new SQLite connection: WAL lets readers run during a
+# write and turns each commit into a single append to the log. The whole
+# file is memory-mapped and the page cache never spills to disk
+# mid-transaction. page_size only takes effect on a new database and
+# must be set before WAL is enabled, so it comes first.
+SQLITE_PRAGMAS = (
+    "PRAGMA page_size=4096",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA cache_spill=OFF",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tunes a freshly opened SQLite connection.
+
+    Args:
+        dbapi_connection: The raw sqlite3 connection.
+        connection_record: The pool's record for the connection.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _find_by_stmt(field: str):
+    """Builds a lookup of users by a single field as a lambda statement.
+
+    Lambda statements are cached by their code location, so executing one
+    skips building and hashing a new select() on every call.
+
+    Args:
+        field (str): The name of the User column to filter on.
+
+    Returns:
+        StatementLambdaElement: The statement, taking a "value" parameter.
+    """
+    column = getattr(User, field)
+    return lambda_stmt(
+        lambda: select(User).where(column == bindparam("value")))
+
+
+FIND_BY_STMTS = {field: _find_by_stmt(field) for field in VALID_FIELDS}
 
-VALID_FIELDS = ['id', 'email', 'hashed_password', 'session_id', 'reset_token']
 
 class DB:
     """
@@ -33,33 +105,107 @@ class DB:
     Methods:
         add_user(email: str, hashed_password: str) -> User:
             Adds a new user to the database.
+        add_users(rows: List[dict]) -> None:
+            Adds many users to the database in a single transaction.
         find_user_by(**kwargs) -> User:
             Finds a user in the database by specified criteria.
+        find_id_by(**kwargs) -> int:
+            Finds the ID of a user without loading the user.
+        exists(**kwargs) -> bool:
+            Checks whether any user matches the criteria.
+        transaction() -> ContextManager[Session]:
+            Groups several writes into a single commit.
         update_user(user_id: int, **kwargs) -> None:
             Updates user attributes in the database.
     """
 
     def __init__(self):
         """
-        Initializes the database engine and creates all tables.
+        Initializes the database engine and creates any missing tables.
+
+        Existing tables and their rows are kept. The database URL is read
+        from the DB_URL environment variable; set it to sqlite:///:memory:
+        to keep the whole database in RAM, e.g. for tests.
         """
-        self._engine = create_engine("sqlite:///a.db", echo=False)
-        Base.metadata.drop_all(self._engine)
+        url = make_url(getenv("DB_URL", DEFAULT_DB_URL))
+        is_sqlite = url.get_backend_name() == "sqlite"
+        in_memory = is_sqlite and url.database in (None, "", ":memory:")
+        if in_memory:
+            # Each connection to :memory: opens a separate, empty database,
+            # so every session has to share a single connection.
+            pool_args = {"poolclass": StaticPool}
+        else:
+            pool_args = {
+                "poolclass": QueuePool,
+                "pool_size": 10,
+                "max_overflow": 20,
+                "pool_timeout": 30,
+                "pool_use_lifo": True,
+            }
+        if is_sqlite:
+            # Sessions are per thread, but pooled connections are not
+            pool_args["connect_args"] = {"check_same_thread": False}
+        self._engine = create_engine(url, echo=False, **pool_args)
+        if is_sqlite and not in_memory:
+            event.listen(self._engine, "connect", _set_sqlite_pragmas)
         Base.metadata.create_all(self._engine)
-        self.__session = None
+        # create_all skips existing tables, indexes included
+        for index in User.__table__.indexes:
+            index.create(self._engine, checkfirst=True)
+        self.__session = scoped_session(partial(DBSession, bind=self._engine))
+        # frozenset of find_user_by criteria -> (expiry, User), least
+        # recent first
+        self._find_cache = OrderedDict()
 
     @property
-    def _session(self):
+    def _session(self) -> Session:
         """
-        Initializes and returns the database session.
+        Returns the database session of the current thread.
+
+        The session is created on first use in each thread.
 
         Returns:
             Session: The SQLAlchemy session object.
         """
-        if self.__session is None:
-            DBSession = sessionmaker(bind=self._engine)
-            self.__session = DBSession()
-        return self.__session
+        return self.__session()
+
+    def remove_session(self) -> None:
+        """
+        Closes the current thread's session and releases its connection.
+
+        Meant to be called at the end of each request.
+        """
+        self.__session.remove()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """
+        Runs a block of writes as one transaction.
+
+        The session is committed when the block completes and rolled back
+        if it raises, so a failed write never leaves locks held. Blocks
+        nest: add_user, add_users and update_user calls made inside an
+        outer block join it, and everything is committed once when the
+        outermost block completes.
+
+        Yields:
+            Session: The SQLAlchemy session object.
+        """
+        session = self._session
+        outermost = not session.info.get("in_transaction")
+        session.info["in_transaction"] = True
+        try:
+            yield session
+            if outermost:
+                session.commit()
+        except BaseException:
+            if outermost:
+                session.rollback()
+            raise
+        finally:
+            if outermost:
+                del session.info["in_transaction"]
+            self._find_cache.clear()
 
     def add_user(self, email: str, hashed_password: str) -> User:
         """
@@ -75,15 +221,38 @@ class DB:
         if not email or not hashed_password:
             return None
         user = User(email=email, hashed_password=hashed_password)
-        session = self._session
-        session.add(user)
-        session.commit()
+        with self.transaction() as session:
+            session.add(user)
+            # Assigns the ID now, even when joining an outer transaction
+            session.flush()
         return user
 
+    def add_users(self, rows: List[dict]) -> None:
+        """
+        Adds many users to the database in a single transaction.
+
+        Args:
+            rows (List[dict]): One mapping of user attributes per user.
+
+        Raises:
+            ValueError: If any row contains an invalid field.
+        """
+        if not rows:
+            return
+        if any(not row.keys() <= VALID_FIELDS for row in rows):
+            raise ValueError
+        with self.transaction() as session:
+            session.bulk_insert_mappings(User, rows)
+
     def find_user_by(self, **kwargs) -> User:
         """
         Finds a user in the database by specified criteria.
 
+        Results are cached for FIND_CACHE_TTL seconds, except lookups on
+        UNCACHED_FIELDS. Only this instance's own writes invalidate the
+        cache, so it is only exact while this instance is the single
+        writer; other writers' changes show up once an entry expires.
+
         Args:
             **kwargs: Arbitrary keyword arguments specifying user attributes.
 
@@ -93,14 +262,79 @@ class DB:
         Raises:
             InvalidRequestError: If no criteria are specified or invalid fields are provided.
             NoResultFound: If no user is found matching the criteria.
+            MultipleResultsFound: If more than one user matches the criteria.
         """
-        if not kwargs or any(x not in VALID_FIELDS for x in kwargs):
+        if not kwargs or not kwargs.keys() <= VALID_FIELDS:
             raise InvalidRequestError
+        cacheable = kwargs.keys().isdisjoint(UNCACHED_FIELDS)
+        if cacheable:
+            key = frozenset(kwargs.items())
+            entry = self._find_cache.get(key)
+            if entry is not None and entry[0] > monotonic():
+                self._find_cache.move_to_end(key)
+                return entry[1]
         session = self._session
-        try:
-            return session.query(User).filter_by(**kwargs).one()
-        except Exception:
-            raise NoResultFound
+        # Overwrite users already in the session with the row just read
+        options = {"populate_existing": True}
+        field, value = next(iter(kwargs.items()))
+        if len(kwargs) == 1 and value is not None:
+            result = session.execute(FIND_BY_STMTS[field], {"value": value},
+                                     execution_options=options)
+        else:
+            # None has to become IS NULL, which filter_by takes care of
+            result = session.execute(select(User).filter_by(**kwargs),
+                                     execution_options=options)
+        user = result.scalar_one()
+        if not cacheable:
+            return user
+        self._find_cache[key] = (monotonic() + FIND_CACHE_TTL, user)
+        self._find_cache.move_to_end(key)
+        if len(self._find_cache) > FIND_CACHE_SIZE:
+            self._find_cache.popitem(last=False)
+        return user
+
+    def find_id_by(self, **kwargs) -> int:
+        """
+        Finds the ID of a user without loading the whole User object.
+
+        Args:
+            **kwargs: Arbitrary keyword arguments specifying user attributes.
+
+        Returns:
+            int: The ID of the found user.
+
+        Raises:
+            InvalidRequestError: If no criteria are specified or invalid
+                fields are provided.
+            NoResultFound: If no user is found matching the criteria.
+            MultipleResultsFound: If more than one user matches the criteria.
+        """
+        if not kwargs or not kwargs.keys() <= VALID_FIELDS:
+            raise InvalidRequestError
+        stmt = select(User.id).filter_by(**kwargs)
+        return self._session.execute(stmt).scalar_one()
+
+    def exists(self, **kwargs) -> bool:
+        """
+        Checks whether any user matches the criteria.
+
+        Only the ID column is read, so a filter on an indexed column is
+        answered from the index alone.
+
+        Args:
+            **kwargs: Arbitrary keyword arguments specifying user attributes.
+
+        Returns:
+            bool: True if at least one user matches, False otherwise.
+
+        Raises:
+            InvalidRequestError: If no criteria are specified or invalid
+                fields are provided.
+        """
+        if not kwargs or not kwargs.keys() <= VALID_FIELDS:
+            raise InvalidRequestError
+        stmt = select(User.id).filter_by(**kwargs).limit(1)
+        return self._session.execute(stmt).first() is not None
 
     def update_user(self, user_id: int, **kwargs) -> None:
         """
@@ -112,11 +346,26 @@ class DB:
 
         Raises:
             ValueError: If any of the provided fields are invalid.
+            NoResultFound: If no user has the given ID.
         """
+        if not kwargs.keys() <= VALID_FIELDS:
+            raise ValueError
+        if user_id is None:
+            raise NoResultFound
         session = self._session
-        user = self.find_user_by(id=user_id)
-        for k, v in kwargs.items():
-            if k not in VALID_FIELDS:
-                raise ValueError
-            setattr(user, k, v)
-        session.commit()
+        if not kwargs:
+            if session.get(User, user_id) is None:
+                raise NoResultFound
+            return
+        # Always written: a loaded user's values may be stale, so comparing
+        # against them could skip a write another process made necessary.
+        stmt = update(User).where(User.id == user_id).values(**kwargs)
+        with self.transaction():
+            result = session.execute(
+                stmt, execution_options={"synchronize_session": False})
+            if result.rowcount == 0:
+                raise NoResultFound
+        user = session.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            for k, v in kwargs.items():
+                set_committed_value(user, k, v)